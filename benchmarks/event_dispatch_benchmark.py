@@ -0,0 +1,91 @@
+# coding=utf-8
+"""
+Measures the cost of dispatching the mesh data collected event through OctoPrint's event bus
+with many listeners, comparing the legacy full mesh payload with the summary payload.
+
+Requires OctoPrint and the plugin to be installed (pip install -e .):
+
+	python benchmarks/event_dispatch_benchmark.py --listeners 50 --size 50 --events 200
+"""
+from __future__ import absolute_import, print_function
+
+import argparse
+import json
+import logging
+import threading
+import timeit
+
+import octoprint.plugin
+from octoprint.events import EventManager, Events
+
+from octoprint_bedlevelvisualizer import bedlevelvisualizer
+
+EVENT = "plugin_bedlevelvisualizer_mesh_data_collected"
+DONE = "plugin_bedlevelvisualizer_benchmark_done"
+
+
+def synthetic_mesh(size):
+	return [["{:.3f}".format(((x * y) % 7 - 3) / 10.0) for x in range(size)] for y in range(size)]
+
+
+def payloads(size):
+	plugin = bedlevelvisualizer()
+	mesh = synthetic_mesh(size)
+	bed = dict(type="rectangular", x_min=0, x_max=235, y_min=0, y_max=235, z_min=0, z_max=250)
+	mesh_id, mesh_version = plugin.cache_mesh(mesh, bed)
+	summary = plugin.mesh_summary(mesh_id, mesh_version, mesh)
+	legacy = dict(mesh=mesh, bed=bed)
+	return legacy, summary
+
+
+def listeners(count):
+	logger = logging.getLogger("benchmark.listener")
+
+	# typical handlers: most only look at the event name, some serialize the payload (websocket push, mqtt)
+	def log_name(event, payload):
+		logger.debug(event)
+
+	def serialize(event, payload):
+		json.dumps(payload)
+
+	return [serialize if i % 5 == 0 else log_name for i in range(count)]
+
+
+def dispatch(manager, payload, events):
+	done = threading.Event()
+	callback = lambda event, payload: done.set()
+	manager.subscribe(DONE, callback)
+	for _ in range(events):
+		manager.fire(EVENT, payload=payload)
+	manager.fire(DONE)
+	done.wait()
+	manager.unsubscribe(DONE, callback)
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+	parser.add_argument("--listeners", type=int, default=50)
+	parser.add_argument("--size", type=int, default=50, help="mesh points per axis")
+	parser.add_argument("--events", type=int, default=200, help="events fired per run")
+	parser.add_argument("--repeat", type=int, default=5)
+	args = parser.parse_args()
+
+	# an empty plugin manager, so the bus only dispatches to the listeners registered below
+	octoprint.plugin.plugin_manager(init=True, plugin_folders=[], plugin_bases=[], plugin_entry_points=[])
+
+	manager = EventManager()
+	manager.fire(Events.STARTUP)
+	for listener in listeners(args.listeners):
+		# subscribe ignores duplicate callbacks, wrap each one
+		manager.subscribe(EVENT, lambda event, payload, listener=listener: listener(event, payload))
+
+	legacy, summary = payloads(args.size)
+	print("{} listeners, {}x{} mesh, {} events per run".format(args.listeners, args.size, args.size, args.events))
+	for name, payload in (("legacy", legacy), ("summary", summary)):
+		best = min(timeit.repeat(lambda: dispatch(manager, payload, args.events), number=1, repeat=args.repeat))
+		print("{:>8}: {:8.3f} ms per event ({} bytes as json)".format(
+			name, best * 1000.0 / args.events, len(json.dumps(payload))))
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,94 @@
+/*
+ * Runs render_benchmark.html in headless Chrome and prints its results as JSON.
+ *
+ * Serves the page, the plugin's static files and OctoPrint's jquery and knockout on a local
+ * port, waits until the page signals completion and writes the results to stdout.
+ *
+ * Requires puppeteer (npm install puppeteer) and an OctoPrint install for the js libraries:
+ *
+ *   node benchmarks/render_benchmark.js --sizes 10,50,100 --max-points 32 --frames 60
+ *
+ * The OctoPrint package is located with `python -c "import octoprint"`, use --octoprint <path>
+ * to point at it directly.
+ *
+ * License: AGPLv3
+ *
+*/
+
+var child_process = require('child_process');
+var fs = require('fs');
+var http = require('http');
+var path = require('path');
+var puppeteer = require('puppeteer');
+
+var CONTENT_TYPES = {'.html': 'text/html', '.js': 'application/javascript', '.css': 'text/css'};
+
+function option(name, fallback) {
+	var index = process.argv.indexOf('--' + name);
+	return index > -1 ? process.argv[index + 1] : fallback;
+}
+
+function octoprintPath() {
+	var configured = option('octoprint', null);
+	if (configured) {
+		return configured;
+	}
+	var python = option('python', 'python');
+	return child_process.execFileSync(python, ['-c', 'import octoprint, os; print(os.path.dirname(octoprint.__file__))']).toString().trim();
+}
+
+function serve(routes) {
+	return http.createServer(function (request, response) {
+		var url = decodeURIComponent(request.url.split('?')[0]);
+		var prefix = Object.keys(routes).filter(function (route) { return url.indexOf(route) === 0; })[0];
+		var file = prefix ? path.join(routes[prefix], url.slice(prefix.length)) : null;
+		if (!file || file.indexOf(routes[prefix]) !== 0 || !fs.existsSync(file) || !fs.statSync(file).isFile()) {
+			response.writeHead(404);
+			response.end();
+			return;
+		}
+		response.writeHead(200, {'Content-Type': CONTENT_TYPES[path.extname(file)] || 'application/octet-stream'});
+		fs.createReadStream(file).pipe(response);
+	});
+}
+
+function main() {
+	var root = path.resolve(__dirname, '..');
+	var server = serve({
+		'/benchmarks/': path.join(root, 'benchmarks'),
+		'/plugin/bedlevelvisualizer/static/': path.join(root, 'octoprint_bedlevelvisualizer', 'static'),
+		'/octoprint/static/': path.join(octoprintPath(), 'static')
+	});
+	var query = 'sizes=' + option('sizes', '10,25,50,100') + '&max_points=' + option('max-points', '32') + '&frames=' + option('frames', '60');
+	var timeout = parseInt(option('timeout', '300')) * 1000;
+	var browser = null;
+	var errors = [];
+
+	server.listen(0, '127.0.0.1', function () {
+		var url = 'http://127.0.0.1:' + server.address().port + '/benchmarks/render_benchmark.html?' + query;
+		puppeteer.launch({headless: true, args: ['--use-angle=swiftshader', '--enable-unsafe-swiftshader', '--ignore-gpu-blocklist']}).then(function (instance) {
+			browser = instance;
+			return browser.newPage();
+		}).then(function (page) {
+			page.on('pageerror', function (err) { errors.push(String(err)); });
+			return page.goto(url).then(function () {
+				return page.waitForFunction('window.BLV_BENCHMARK_DONE === true', {timeout: timeout, polling: 500});
+			}).then(function () {
+				return page.evaluate(function () { return window.BLV_BENCHMARK_RESULTS; });
+			});
+		}).then(function (results) {
+			results.page_errors = errors;
+			console.log(JSON.stringify(results, null, 2));
+			process.exitCode = (results.error || results.errors.length || errors.length) ? 1 : 0;
+		}).catch(function (err) {
+			console.error('Benchmark failed: ' + err);
+			errors.forEach(function (error) { console.error(error); });
+			process.exitCode = 1;
+		}).then(function () {
+			server.close();
+			return browser && browser.close();
+		});
+	});
+}
+
+main();
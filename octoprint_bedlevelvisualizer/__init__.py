@@ -2,6 +2,7 @@
 from __future__ import absolute_import
 
 import threading
+import uuid
 
 import octoprint.plugin
 from octoprint.events import Events
@@ -9,6 +10,7 @@ import re
 import logging
 import flask
 import json
+from collections import OrderedDict
 from copy import deepcopy
 
 class bedlevelvisualizer(
@@ -39,6 +41,9 @@ class bedlevelvisualizer(
 		self.flip_x = False
 		self.flip_y = False
 		self.timeout_override = False
+		self.mesh_cache = OrderedDict()
+		self.mesh_cache_lock = threading.Lock()
+		self.mesh_version = 0
 		self._logger = logging.getLogger(
 			"octoprint.plugins.bedlevelvisualizer")
 		self._bedlevelvisualizer_logger = logging.getLogger(
@@ -106,7 +111,10 @@ class bedlevelvisualizer(
 			camera_position="-1.25,-1.25,0.25",
 			date_locale_format="",
 			graph_height="450px",
-			show_prusa_adjustments=False
+			show_prusa_adjustments=False,
+			render_decimation=False,
+			render_max_points=32,
+			full_event_payload=False
 		)
 
 	def get_settings_version(self):
@@ -174,6 +182,7 @@ class bedlevelvisualizer(
 				"js/fontawesome-iconpicker.js",
 				"js/ko.iconpicker.js",
 				"js/plotly.min.js",
+				"js/bedlevelvisualizer_worker.js",
 				"js/bedlevelvisualizer.js",
 			],
 			css=[
@@ -529,9 +538,68 @@ class bedlevelvisualizer(
 
 	def send_mesh_data_collected_event(self, mesh_data, bed_data):
 		event = Events.PLUGIN_BEDLEVELVISUALIZER_MESH_DATA_COLLECTED
-		custom_payload = dict(mesh=mesh_data, bed=bed_data)
+		mesh_id, mesh_version = self.cache_mesh(mesh_data, bed_data)
+		# listeners get a summary, the full mesh is available via the get_mesh helper
+		custom_payload = self.mesh_summary(mesh_id, mesh_version, mesh_data)
+		if self._settings.get_boolean(["full_event_payload"]):
+			custom_payload.update(mesh=mesh_data, bed=bed_data)
 		self._event_bus.fire(event, payload=custom_payload)
 
+	def mesh_summary(self, mesh_id, mesh_version, mesh_data):
+		return dict(
+			id=mesh_id,
+			version=mesh_version,
+			rows=len(mesh_data),
+			columns=len(mesh_data[0]) if len(mesh_data) > 0 else 0,
+			statistics=self.mesh_statistics(mesh_data),
+		)
+
+	def mesh_statistics(self, mesh_data):
+		values = []
+		for row in mesh_data:
+			for value in row:
+				# skip masked (None) and unprobed (".") points
+				try:
+					values.append(float(value))
+				except (TypeError, ValueError):
+					continue
+		if len(values) == 0:
+			return dict(min=None, max=None, mean=None, range=None)
+		s_min = min(values)
+		s_max = max(values)
+		return dict(
+			min=round(s_min, 4),
+			max=round(s_max, 4),
+			mean=round(sum(values) / len(values), 4),
+			range=round(s_max - s_min, 4),
+		)
+
+	# Mesh cache, keeps the last MAX_HISTORY meshes for the get_mesh helper
+
+	def cache_mesh(self, mesh_data, bed_data):
+		with self.mesh_cache_lock:
+			self.mesh_version += 1
+			mesh_id = uuid.uuid4().hex
+			self.mesh_cache[mesh_id] = dict(
+				id=mesh_id,
+				version=self.mesh_version,
+				mesh=deepcopy(mesh_data),
+				bed=deepcopy(bed_data),
+			)
+			while len(self.mesh_cache) > self.MAX_HISTORY:
+				self.mesh_cache.popitem(last=False)
+			return mesh_id, self.mesh_version
+
+	def get_mesh(self, mesh_id=None):
+		# returns a copy of the cached mesh with given id, or the latest one if no id is given
+		with self.mesh_cache_lock:
+			if mesh_id is None:
+				if len(self.mesh_cache) == 0:
+					return None
+				mesh_id = next(reversed(self.mesh_cache))
+			cached = self.mesh_cache.get(mesh_id)
+			return deepcopy(cached) if cached is not None else None
+
 	def register_custom_events(*args, **kwargs):
 		return ["mesh_data_collected"]
 
@@ -595,6 +663,9 @@ def __plugin_load__():
 	global __plugin_implementation__
 	__plugin_implementation__ = bedlevelvisualizer()
 
+	global __plugin_helpers__
+	__plugin_helpers__ = dict(get_mesh=__plugin_implementation__.get_mesh)
+
 	global __plugin_hooks__
 	__plugin_hooks__ = {
 		"octoprint.comm.protocol.action": __plugin_implementation__.custom_action_handler,
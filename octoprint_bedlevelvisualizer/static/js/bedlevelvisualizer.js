@@ -52,15 +52,18 @@ $(function () {
 		self.descending_x = ko.observable();
 		self.descending_y = ko.observable();
 		self.mesh_zero = ko.observable(0);
-		self.mesh_adjustment = ko.computed(
+		// pure so the table is only calculated while the corrections table is displayed
+		self.mesh_adjustment = ko.pureComputed(
 			function() {
+				var zero = parseFloat(self.mesh_zero());
+				var factor = parseFloat(self.mesh_unit()) * 360 / (self.imperial()?25.4/parseFloat(self.screw_hub()):parseFloat(self.screw_hub()));
 				var degrees = ko.utils.arrayMap(
 					self.mesh_data(),
 					function(line) {
 					return ko.utils.arrayMap(
 						line,
 						function(item) {
-						return ((parseFloat(item) - parseFloat(self.mesh_zero())) * parseFloat(self.mesh_unit()) * 360 / (self.imperial()?25.4/parseFloat(self.screw_hub()):parseFloat(self.screw_hub())));
+						return (parseFloat(item) - zero) * factor;
 						}
 				);
 					}
@@ -71,8 +74,51 @@ $(function () {
 		self.turn = ko.observable(0);
 		self.graph_z_limits = ko.observable();
 
+		// formatted cell text per mesh array, so re-rendering a table does not parse and format every cell again
+		self.cell_text_cache = (typeof WeakMap !== 'undefined') ? new WeakMap() : null;
+
 		self.get_cell_text = function(item) {
-			return (!item.$parentContext.$parent.len?Math.abs(parseFloat(item.$parentContext.$parent.mesh[item.$root.descending_y()?item.$root.mesh_data_y().length-1-item.$parentContext.$index():item.$parentContext.$index()][item.$root.descending_x()?item.$root.mesh_data_x().length-1-item.$index():item.$index()])):parseFloat(item.$parentContext.$parent.mesh[item.$root.descending_y()?item.$root.mesh_data_y().length-1-item.$parentContext.$index():item.$parentContext.$index()][item.$root.descending_x()?item.$root.mesh_data_x().length-1-item.$index():item.$index()])).toFixed(item.$parentContext.$parent.len);
+			var table = item.$parentContext.$parent;
+			var row = item.$root.descending_y()?item.$root.mesh_data_y().length-1-item.$parentContext.$index():item.$parentContext.$index();
+			var col = item.$root.descending_x()?item.$root.mesh_data_x().length-1-item.$index():item.$index();
+			var cells = null;
+			if (self.cell_text_cache && table.mesh) {
+				var cached = self.cell_text_cache.get(table.mesh);
+				if (!cached || cached.len !== table.len) {
+					cached = {len: table.len, rows: []};
+					self.cell_text_cache.set(table.mesh, cached);
+				}
+				cells = cached.rows[row] || (cached.rows[row] = []);
+				if (cells[col] !== undefined) {
+					return cells[col];
+				}
+			}
+			var text = (!table.len?Math.abs(parseFloat(table.mesh[row][col])):parseFloat(table.mesh[row][col])).toFixed(table.len);
+			if (cells) {
+				cells[col] = text;
+			}
+			return text;
+		};
+
+		self.graph = {
+			worker: null,
+			pending: null,
+			request_id: 0,
+			mesh_revision: 0,
+			data_revision: 0,
+			full: null,
+			prepared: null,
+			zoomed: false,
+			zoom_factor: 0.75,
+			zoom_distance: 0,
+			pixels_per_point: 8,
+			template_key: null,
+			camera_eye: null,
+			data: null,
+			layout: null,
+			config: null,
+			foreground_color: null,
+			events_bound: false
 		};
 
 		self.onBeforeBinding = function() {
@@ -118,6 +164,7 @@ $(function () {
 			if(self.settingsViewModel.settings.plugins.bedlevelvisualizer.colorscale().length === 0) { self.settingsViewModel.settings.plugins.bedlevelvisualizer.colorscale('[[0, "rebeccapurple"],[0.4, "rebeccapurple"],[0.45, "blue"],[0.5, "green"],[0.55, "yellow"],[0.6, "red"],[1, "red"]]');}
 			if(self.settingsViewModel.settings.plugins.bedlevelvisualizer.rotation().length === 0) {self.settingsViewModel.settings.plugins.bedlevelvisualizer.rotation(0);}
 			if(self.settingsViewModel.settings.plugins.bedlevelvisualizer.timeout().length === 0) {self.settingsViewModel.settings.plugins.bedlevelvisualizer.timeout(1800);}
+			if(self.settingsViewModel.settings.plugins.bedlevelvisualizer.render_max_points().length === 0) {self.settingsViewModel.settings.plugins.bedlevelvisualizer.render_max_points(32);}
 /*			if(self.settingsViewModel.settings.plugins.bedlevelvisualizer.show_prusa_adjustments()) {
 				self.settingsViewModel.settings.plugins.bedlevelvisualizer.use_relative_offsets(true);
 				self.settingsViewModel.settings.plugins.bedlevelvisualizer.use_center_origin(true);
@@ -223,171 +270,298 @@ $(function () {
 				}
 			}
 
-			try {
-				var graphcolorscale = (self.settingsViewModel.settings.plugins.bedlevelvisualizer.colorscale().charAt(0) === "[") ? JSON.parse(self.settingsViewModel.settings.plugins.bedlevelvisualizer.colorscale()) : self.settingsViewModel.settings.plugins.bedlevelvisualizer.colorscale();
-				if (graphcolorscale.length === 0) graphcolorscale = [[0, "rebeccapurple"],[0.4, "rebeccapurple"],[0.45, "blue"],[0.5, "green"],[0.55, "yellow"],[0.6, "red"],[1, "red"]];
-				var data = [{
-						z: mesh_data_z,
-						x: mesh_data_x,
-						y: mesh_data_y,
-						type: 'surface',
-						colorbar: {
-							tickfont: {
-								color: $('#tabs_content').css('color')
+			var full = {z: mesh_data_z, x: mesh_data_x, y: mesh_data_y};
+			self.prepareMesh(mesh_data_z, mesh_data_x, mesh_data_y, function(prepared) {
+				self.graph.mesh_revision++;
+				self.graph.full = full;
+				self.graph.prepared = prepared;
+				self.graph.zoomed = false;
+				var plotted = self.plotGraph(true);
+				if (plotted) {
+					plotted.then(self.postPlotHandler);
+				}
+			});
+		};
+
+		// maximum points per axis to render, 0 renders the full mesh
+		self.renderMaxPoints = function() {
+			if (!self.settingsViewModel.settings.plugins.bedlevelvisualizer.render_decimation()) {
+				return 0;
+			}
+			var max_points = parseInt(self.settingsViewModel.settings.plugins.bedlevelvisualizer.render_max_points());
+			var graph_width = $('#bedlevelvisualizergraph').width();
+			if (graph_width > 0) {
+				// no point in rendering more samples than the viewport can show
+				max_points = Math.min(max_points, Math.floor(graph_width / self.graph.pixels_per_point));
+			}
+			return Math.max(max_points, 2);
+		};
+
+		self.meshWorker = function() {
+			if (self.graph.worker === null) {
+				try {
+					self.graph.worker = new Worker(BASEURL + 'plugin/bedlevelvisualizer/static/js/bedlevelvisualizer_worker.js');
+					self.graph.worker.onmessage = function(event) {
+						var pending = self.graph.pending;
+						// replies for meshes that have been superseded in the meantime are dropped
+						if (pending && event.data.id === pending.request.id && event.data.id === self.graph.request_id) {
+							self.graph.pending = null;
+							pending.callback(event.data);
+						}
+					};
+					self.graph.worker.onerror = function(event) {
+						console.log('Bed Visualizer worker failed, preparing mesh on the main thread: ' + event.message);
+						self.graph.worker.terminate();
+						self.graph.worker = false;
+						var pending = self.graph.pending;
+						if (pending) {
+							self.graph.pending = null;
+							try {
+								pending.callback(BedLevelVisualizerMesh.prepare(pending.request));
+							} catch(err) {
+								self.renderError(err, pending.request.mesh);
 							}
-						},
-						autocolorscale: false,
-						colorscale: graphcolorscale
-					}
-				];
+						}
+					};
+				} catch(err) {
+					self.graph.worker = false;
+				}
+			}
+			return self.graph.worker || null;
+		};
 
-				if(self.graph_z_limits().split(",")[0] !== 'auto'){
-					data[0]['cmin'] = self.graph_z_limits().split(",")[0];
-					data[0]['cmax'] = self.graph_z_limits().split(",")[1];
+		self.prepareMesh = function(mesh_data_z, mesh_data_x, mesh_data_y, callback) {
+			var request = {
+				id: ++self.graph.request_id,
+				mesh: mesh_data_z,
+				x: mesh_data_x,
+				y: mesh_data_y,
+				max_points: self.renderMaxPoints(),
+				prusa: self.settingsViewModel.settings.plugins.bedlevelvisualizer.show_prusa_adjustments()
+			};
+			// meshes that will not be decimated, including the default rendering mode, are not worth the round trip
+			var decimate = request.max_points && (mesh_data_z.length > request.max_points || (mesh_data_z[0] || []).length > request.max_points);
+			var worker = decimate ? self.meshWorker() : null;
+			if (worker) {
+				try {
+					self.graph.pending = {request: request, callback: callback};
+					worker.postMessage(request);
+					return;
+				} catch(err) {
+					self.graph.pending = null;
 				}
+			}
+			self.graph.pending = null;
+			try {
+				callback(BedLevelVisualizerMesh.prepare(request));
+			} catch(err) {
+				self.renderError(err, mesh_data_z);
+			}
+		};
 
-				var background_color = $('#tabs_content').css('background-color');
-				var foreground_color = $('#tabs_content').css('color');
-				var camera_position = self.settingsViewModel.settings.plugins.bedlevelvisualizer.camera_position().split(",");
-
-				var layout = {
-					//title: 'Bed Leveling Mesh',
-					autosize: true,
-					plot_bgcolor: background_color,
-					paper_bgcolor: background_color,
-					margin: {
-						l: 0,
-						r: 0,
-						b: 0,
-						t: 0
-					},
-					scene: {
-						camera: {
-							eye: {
-								x: (camera_position.length === 3) ? camera_position[0] : -1.25,
-								y: (camera_position.length === 3) ? camera_position[1] : -1.25,
-								z: (camera_position.length === 3) ? camera_position[2] : 0.25
-							}
-						},
-						xaxis: {
-							color: foreground_color,
-							zerolinecolor: '#00FF00',
-							zerolinewidth: 4
-						},
-						yaxis: {
-							color: foreground_color,
-							zerolinecolor: '#FF0000',
-							zerolinewidth: 4
-						},
-						zaxis: {
-							color: foreground_color,
-							range: (self.graph_z_limits().split(",")[0] !== 'auto') ? self.graph_z_limits().split(',') : [-2,2],
-							zerolinecolor: '#0000FF',
-							zerolinewidth: 4
+		// data, layout and config objects are kept between renders and only rebuilt when their inputs change
+		self.graphTemplate = function() {
+			var background_color = $('#tabs_content').css('background-color');
+			var foreground_color = $('#tabs_content').css('color');
+			var colorscale_setting = self.settingsViewModel.settings.plugins.bedlevelvisualizer.colorscale();
+			var camera_setting = self.settingsViewModel.settings.plugins.bedlevelvisualizer.camera_position();
+			var template_key = [background_color, foreground_color, colorscale_setting, camera_setting, self.graph_z_limits()].join('|');
+			if (self.graph.template_key === template_key) {
+				return;
+			}
+
+			var graphcolorscale = (colorscale_setting.charAt(0) === "[") ? JSON.parse(colorscale_setting) : colorscale_setting;
+			if (graphcolorscale.length === 0) graphcolorscale = [[0, "rebeccapurple"],[0.4, "rebeccapurple"],[0.45, "blue"],[0.5, "green"],[0.55, "yellow"],[0.6, "red"],[1, "red"]];
+			var data = [{
+					z: [],
+					x: [],
+					y: [],
+					type: 'surface',
+					colorbar: {
+						tickfont: {
+							color: foreground_color
 						}
+					},
+					autocolorscale: false,
+					colorscale: graphcolorscale
+				}
+			];
+
+			if(self.graph_z_limits().split(",")[0] !== 'auto'){
+				data[0]['cmin'] = self.graph_z_limits().split(",")[0];
+				data[0]['cmax'] = self.graph_z_limits().split(",")[1];
+			}
+
+			var camera_position = camera_setting.split(",");
+			var camera_eye = {
+				x: (camera_position.length === 3) ? camera_position[0] : -1.25,
+				y: (camera_position.length === 3) ? camera_position[1] : -1.25,
+				z: (camera_position.length === 3) ? camera_position[2] : 0.25
+			};
+
+			var layout = {
+				//title: 'Bed Leveling Mesh',
+				autosize: true,
+				plot_bgcolor: background_color,
+				paper_bgcolor: background_color,
+				margin: {
+					l: 0,
+					r: 0,
+					b: 0,
+					t: 0
+				},
+				scene: {
+					camera: {
+						eye: $.extend({}, camera_eye)
+					},
+					xaxis: {
+						color: foreground_color,
+						zerolinecolor: '#00FF00',
+						zerolinewidth: 4
+					},
+					yaxis: {
+						color: foreground_color,
+						zerolinecolor: '#FF0000',
+						zerolinewidth: 4
+					},
+					zaxis: {
+						color: foreground_color,
+						range: (self.graph_z_limits().split(",")[0] !== 'auto') ? self.graph_z_limits().split(',') : [-2,2],
+						zerolinecolor: '#0000FF',
+						zerolinewidth: 4
 					}
-				};
-
-				var config_options = {
-					displaylogo: false,
-					showEditInChartStudio: true,
-					responsive: true,
-					plotlyServerURL: "https://chart-studio.plotly.com",
-					modeBarButtonsToRemove: ['resetCameraDefault3d'],
-					modeBarButtonsToAdd: [{
-						name: 'Move Nozzle',
-						icon: Plotly.Icons.autoscale,
-						toggle: true,
-						click: function(gd, ev) {
-								var button = ev.currentTarget;
-								var button_enabled = button._previousVal || false;
-								if (!button_enabled) {
-									gd.on('plotly_click', function(data) {
-											var gcode_command = 'G0 X' + data.points[0].x + ' Y' + data.points[0].y + ' F4000';
-											OctoPrint.control.sendGcode([gcode_command]);
-										});
-									button._previousVal = true;
-								} else {
-									gd.removeAllListeners('plotly_click');
-									button._previousVal = null;
-								}
+				}
+			};
+
+			self.graph.data = data;
+			self.graph.layout = layout;
+			self.graph.foreground_color = foreground_color;
+			self.graph.camera_eye = camera_eye;
+			self.graph.zoom_distance = self.graph.zoom_factor * Math.sqrt(Math.pow(camera_eye.x, 2) + Math.pow(camera_eye.y, 2) + Math.pow(camera_eye.z, 2));
+			self.graph.template_key = template_key;
+		};
+
+		self.graphConfig = function() {
+			if (self.graph.config) {
+				return self.graph.config;
+			}
+			self.graph.config = {
+				displaylogo: false,
+				showEditInChartStudio: true,
+				responsive: true,
+				plotlyServerURL: "https://chart-studio.plotly.com",
+				modeBarButtonsToRemove: ['resetCameraDefault3d'],
+				modeBarButtonsToAdd: [{
+					name: 'Move Nozzle',
+					icon: Plotly.Icons.autoscale,
+					toggle: true,
+					click: function(gd, ev) {
+							var button = ev.currentTarget;
+							var button_enabled = button._previousVal || false;
+							if (!button_enabled) {
+								gd.on('plotly_click', function(data) {
+										var gcode_command = 'G0 X' + data.points[0].x + ' Y' + data.points[0].y + ' F4000';
+										OctoPrint.control.sendGcode([gcode_command]);
+									});
+								button._previousVal = true;
+							} else {
+								gd.removeAllListeners('plotly_click');
+								button._previousVal = null;
 							}
-						}]};
+						}
+					}]};
+			return self.graph.config;
+		};
 
-				// calculate min/max value.
-				let s_min = Math.min(...mesh_data_z.flat());
-				let s_max = Math.max(...mesh_data_z.flat());
-				let s_var = s_max - s_min;
+		self.graphAnnotations = function(prepared) {
+			var s_min = prepared.stats.min;
+			var s_max = prepared.stats.max;
+			var s_var = s_max - s_min;
+
+			var annotations = [{
+				xref: 'paper',
+				yref: 'paper',
+				x: 1,
+				xanchor: 'right',
+				y: 0,
+				yanchor: 'bottom',
+				text: 'Min: ' + s_min + '<br>Max: ' + s_max + '<br>Var: ' + s_var,
+				showarrow: false,
+				font: {
+					color: self.graph.foreground_color
+				}
+			}];
 
-				layout.annotations = [{
-					xref: 'paper',
+			// Prusa Bed Level Correction
+			if(prepared.prusa) {
+				annotations.push({xref: 'paper',
 					yref: 'paper',
 					x: 1,
 					xanchor: 'right',
-					y: 0,
-					yanchor: 'bottom',
-					text: 'Min: ' + s_min + '<br>Max: ' + s_max + '<br>Var: ' + s_var,
+					y: 1,
+					yanchor: 'top',
+					text: 'Back [um]:' + prepared.prusa.back + '<br>Front [um]:' + prepared.prusa.front + '<br>Left [um]:' + prepared.prusa.left + '<br>Right [um]:' + prepared.prusa.right,
 					showarrow: false,
 					font: {
-						color: foreground_color
-					}
-				}];
-
-				// Prusa Bed Level Correction
-				if(self.settingsViewModel.settings.plugins.bedlevelvisualizer.show_prusa_adjustments()) {
-					let back_half = mesh_data_z.slice(0, mesh_data_z.length/2).join().split(',');
-					let front_half = mesh_data_z.slice(mesh_data_z.length/2).join().split(',');
-					let left_half = (back_half.slice(0,back_half.length/2) + front_half.slice(0,front_half.length/2)).split(',');
-					let right_half = (back_half.slice(back_half.length/2) + front_half.slice(front_half.length/2)).split(',');
-
-					let back_half_total = 0;
-					let front_half_total = 0;
-					let left_half_total = 0;
-					let right_half_total = 0;
-
-					for(let i=0;i<back_half.length;i++){
-						back_half_total += parseFloat(back_half[i]);
-					}
-
-					for(let i=0;i<front_half.length;i++){
-						front_half_total += parseFloat(front_half[i]);
-					}
-
-					for(let i=0;i<left_half.length;i++){
-						left_half_total += parseFloat(left_half[i]);
-					}
-
-					for(let i=0;i<right_half.length;i++){
-						right_half_total += parseFloat(right_half[i]);
+						color: self.graph.foreground_color
 					}
+				});
+			}
+			return annotations;
+		};
 
-					let back_half_um = Math.round((back_half_total/back_half.length)*1000);
-					let front_half_um = Math.round((front_half_total/front_half.length)*1000);
-					let left_half_um = Math.round((left_half_total/left_half.length)*1000);
-					let right_half_um = Math.round((right_half_total/right_half.length)*1000);
-					layout.annotations.push({xref: 'paper',
-						yref: 'paper',
-						x: 1,
-						xanchor: 'right',
-						y: 1,
-						yanchor: 'top',
-						text: 'Back [um]:' + back_half_um + '<br>Front [um]:' + front_half_um + '<br>Left [um]:' + left_half_um + '<br>Right [um]:' + right_half_um,
-						showarrow: false,
-						font: {
-							color: foreground_color
-						}
-					});
+		// render the prepared (possibly decimated) mesh, or the full mesh while zoomed in
+		self.plotGraph = function(reset_camera) {
+			var prepared = self.graph.prepared;
+			try {
+				self.graphTemplate();
+				var trace = (self.graph.zoomed || !prepared.decimated) ? self.graph.full : prepared;
+				self.graph.data[0].z = trace.z;
+				self.graph.data[0].x = trace.x;
+				self.graph.data[0].y = trace.y;
+				self.graph.layout.annotations = self.graphAnnotations(prepared);
+				self.graph.layout.datarevision = ++self.graph.data_revision;
+				// Plotly stores the user's camera in the layout object, so it has to be reset to the
+				// configured position explicitly for a new mesh and is kept when switching detail levels
+				if (reset_camera) {
+					self.graph.layout.scene.camera = {eye: $.extend({}, self.graph.camera_eye)};
 				}
+				self.graph.layout.uirevision = self.graph.mesh_revision;
 
 				// graph surface
-				Plotly.react('bedlevelvisualizergraph', data, layout, config_options).then(self.postPlotHandler);
+				return Plotly.react('bedlevelvisualizergraph', self.graph.data, self.graph.layout, self.graphConfig()).then(self.bindGraphEvents);
 			} catch(err) {
-				new PNotify({
-						title: 'Bed Visualizer Error',
-						text: '<div class="row-fluid">Errors while attempting render of mesh data.</div><div class="row-fluid">Error:</div><div class="row-fluid"><pre style="padding-top: 5px;">'+err+'</pre></div><div class="row-fluid">Received Data:</div><div class="row-fluid"><pre style="padding-top: 5px;">'+data+'</pre></div>',
-						type: 'error',
-						hide: false
-						});
+				self.renderError(err, self.graph.data);
+			}
+		};
+
+		self.renderError = function(err, data) {
+			new PNotify({
+					title: 'Bed Visualizer Error',
+					text: '<div class="row-fluid">Errors while attempting render of mesh data.</div><div class="row-fluid">Error:</div><div class="row-fluid"><pre style="padding-top: 5px;">'+err+'</pre></div><div class="row-fluid">Received Data:</div><div class="row-fluid"><pre style="padding-top: 5px;">'+data+'</pre></div>',
+					type: 'error',
+					hide: false
+					});
+		};
+
+		self.bindGraphEvents = function(gd) {
+			if (!self.graph.events_bound) {
+				gd.on('plotly_relayout', self.onGraphRelayout);
+				self.graph.events_bound = true;
+			}
+			return gd;
+		};
+
+		// swap between decimated and full detail when the camera moves past the zoom threshold
+		self.onGraphRelayout = function(event) {
+			if (!event || !event['scene.camera'] || !self.graph.prepared || !self.graph.prepared.decimated) {
+				return;
+			}
+			var eye = event['scene.camera'].eye;
+			var zoomed = Math.sqrt(Math.pow(eye.x, 2) + Math.pow(eye.y, 2) + Math.pow(eye.z, 2)) < self.graph.zoom_distance;
+			if (zoomed !== self.graph.zoomed) {
+				self.graph.zoomed = zoomed;
+				self.plotGraph();
 			}
 		};
 
@@ -0,0 +1,129 @@
+/*
+ * Mesh preparation for OctoPrint Bed Visualizer
+ *
+ * This file is loaded twice: as a regular asset, where it exposes
+ * window.BedLevelVisualizerMesh for synchronous use, and as a Web Worker,
+ * where it answers prepare requests off the UI thread.
+ *
+ * License: AGPLv3
+ *
+*/
+
+(function (root) {
+	// evenly spaced indices into an axis of given length, always keeping the first and last point
+	function sampleIndices(length, count) {
+		var indices = [];
+		var i;
+		if (!count || count < 2 || count >= length) {
+			for (i = 0; i < length; i++) {
+				indices.push(i);
+			}
+			return indices;
+		}
+		for (i = 0; i < count; i++) {
+			indices.push(Math.round(i * (length - 1) / (count - 1)));
+		}
+		return indices;
+	}
+
+	// reduce mesh to at most max_points per axis by sampling measured points, no interpolation
+	function decimate(mesh_z, mesh_x, mesh_y, max_points) {
+		var rows = sampleIndices(mesh_z.length, max_points);
+		var cols = sampleIndices(mesh_z.length ? mesh_z[0].length : 0, max_points);
+		var z = [];
+		var i, j;
+		for (i = 0; i < rows.length; i++) {
+			var source = mesh_z[rows[i]];
+			var line = [];
+			for (j = 0; j < cols.length; j++) {
+				line.push(source[cols[j]]);
+			}
+			z.push(line);
+		}
+		return {
+			z: z,
+			x: cols.map(function (index) { return mesh_x[index]; }),
+			y: rows.map(function (index) { return mesh_y[index]; }),
+			decimated: rows.length < mesh_z.length || (mesh_z.length > 0 && cols.length < mesh_z[0].length)
+		};
+	}
+
+	// min/max over the full mesh, null counts as 0 and cells that are not numbers (ie "." for unprobed points) are skipped
+	function meshStats(mesh_z) {
+		var min = Infinity;
+		var max = -Infinity;
+		for (var i = 0; i < mesh_z.length; i++) {
+			for (var j = 0; j < mesh_z[i].length; j++) {
+				var value = +mesh_z[i][j];
+				if (value < min) min = value;
+				if (value > max) max = value;
+			}
+		}
+		return {min: min, max: max};
+	}
+
+	// Prusa Bed Level Correction
+	function prusaAdjustments(mesh_data_z) {
+		var back_half = mesh_data_z.slice(0, mesh_data_z.length/2).join().split(',');
+		var front_half = mesh_data_z.slice(mesh_data_z.length/2).join().split(',');
+		var left_half = (back_half.slice(0,back_half.length/2) + front_half.slice(0,front_half.length/2)).split(',');
+		var right_half = (back_half.slice(back_half.length/2) + front_half.slice(front_half.length/2)).split(',');
+
+		var back_half_total = 0;
+		var front_half_total = 0;
+		var left_half_total = 0;
+		var right_half_total = 0;
+		var i;
+
+		for(i=0;i<back_half.length;i++){
+			back_half_total += parseFloat(back_half[i]);
+		}
+
+		for(i=0;i<front_half.length;i++){
+			front_half_total += parseFloat(front_half[i]);
+		}
+
+		for(i=0;i<left_half.length;i++){
+			left_half_total += parseFloat(left_half[i]);
+		}
+
+		for(i=0;i<right_half.length;i++){
+			right_half_total += parseFloat(right_half[i]);
+		}
+
+		return {
+			back: Math.round((back_half_total/back_half.length)*1000),
+			front: Math.round((front_half_total/front_half.length)*1000),
+			left: Math.round((left_half_total/left_half.length)*1000),
+			right: Math.round((right_half_total/right_half.length)*1000)
+		};
+	}
+
+	// everything drawMesh needs that scales with the mesh size
+	function prepare(request) {
+		var prepared = decimate(request.mesh, request.x, request.y, request.max_points);
+		prepared.stats = meshStats(request.mesh);
+		if (request.prusa) {
+			prepared.prusa = prusaAdjustments(request.mesh);
+		}
+		return prepared;
+	}
+
+	var api = {
+		sampleIndices: sampleIndices,
+		decimate: decimate,
+		meshStats: meshStats,
+		prusaAdjustments: prusaAdjustments,
+		prepare: prepare
+	};
+
+	if (typeof WorkerGlobalScope !== "undefined" && root instanceof WorkerGlobalScope) {
+		root.onmessage = function (event) {
+			var prepared = prepare(event.data);
+			prepared.id = event.data.id;
+			root.postMessage(prepared);
+		};
+	} else {
+		root.BedLevelVisualizerMesh = api;
+	}
+})(self);